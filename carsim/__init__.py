@@ -1,2 +1,2 @@
-from .car_simulation import Car
+from .car_simulation import Car, CarFleet
 from .track import TrackSpline
@@ -1,6 +1,17 @@
+import math
+
 import numpy as np
 
+try:
+    import numba
+except ImportError:  # numba is optional, the numpy implementation is used if it isn't installed
+    numba = None
+
 from .track import TrackSpline
+from .util import vector_norms
+
+# Use the fused numba kernel in `CarFleet.step` (if numba is installed)
+USE_NUMBA = numba is not None
 
 
 class Car:
@@ -9,12 +20,33 @@ class Car:
         self.tire_grip = tire_grip
         self.wheel_base = wheel_base
         self.max_steering_angle = max_steering_angle
-        self.position = np.array([0.0, 0.0])
-        self.velocity = np.array([0.0, 0.0])
+        # Per-car state is kept as plain floats, since numpy's per-call overhead dominates on 2-element vectors
+        self.position_x = 0.0
+        self.position_y = 0.0
+        self.velocity_x = 0.0
+        self.velocity_y = 0.0
         self.heading = 0.0  # Car's orientation in radians
         self.steering_angle = 0.0
         self.speed = 0.0
 
+    def get_position(self):
+        """
+        :return: A new numpy array [x, y] with the car's position. Changing it doesn't change the car.
+        """
+        return np.array([self.position_x, self.position_y])
+
+    def set_position(self, x, y):
+        self.position_x, self.position_y = float(x), float(y)
+
+    def get_velocity(self):
+        """
+        :return: A new numpy array [x, y] with the car's velocity. Changing it doesn't change the car.
+        """
+        return np.array([self.velocity_x, self.velocity_y])
+
+    def set_velocity(self, x, y):
+        self.velocity_x, self.velocity_y = float(x), float(y)
+
     def apply_controls(self, throttle, brake, steering_input):
         # Steering input is in the range [-1, 1]
         self.steering_angle = steering_input * self.max_steering_angle
@@ -25,35 +57,188 @@ class Car:
         self.speed += acceleration
 
         # Update position
-        self.velocity = np.array([self.speed * np.sin(self.heading), self.speed * np.cos(self.heading)])
-        self.position += self.velocity
+        self.velocity_x = self.speed * math.sin(self.heading)
+        self.velocity_y = self.speed * math.cos(self.heading)
+        self.position_x += self.velocity_x
+        self.position_y += self.velocity_y
 
         # Apply Ackermann steering and centripetal force
         self._apply_steering()
 
     def _apply_steering(self):
-        turning_radius = self.wheel_base / np.tan(self.steering_angle)
+        tan_steering_angle = math.tan(self.steering_angle)
+        if tan_steering_angle == 0:
+            return  # Infinite turning radius, so the heading doesn't change
+
+        turning_radius = self.wheel_base / tan_steering_angle
         angular_velocity = self.speed / turning_radius
 
         self.heading += angular_velocity
 
     def get_lateral_force(self):
         # Lateral force using simplified Pacejka formula
-        slip_angle = np.arctan2(self.velocity[1], self.velocity[0]) - self.heading
-        lateral_force = self.tire_grip * np.sin(slip_angle)
+        slip_angle = math.atan2(self.velocity_y, self.velocity_x) - self.heading
+        lateral_force = self.tire_grip * math.sin(slip_angle)
         return lateral_force
 
     def update_drift(self):
         lateral_force = self.get_lateral_force()
-        if np.abs(lateral_force) > self.tire_grip:
+        if abs(lateral_force) > self.tire_grip:
             drift_factor = lateral_force / self.tire_grip
-            self.velocity = self.velocity * (1 - drift_factor)  # Simulate drift
+            self.velocity_x *= 1 - drift_factor  # Simulate drift
+            self.velocity_y *= 1 - drift_factor
 
     def detect_boundaries(self, track_spline: TrackSpline):
         # Check if the car is out of bounds using the track spline
-        closest_point = track_spline.get_closest_point(self.position)
-        distance_to_track = np.linalg.norm(self.position - closest_point)
+        closest_point = track_spline.get_closest_point((self.position_x, self.position_y))
+        distance_to_track = math.hypot(self.position_x - closest_point[0], self.position_y - closest_point[1])
         if distance_to_track > track_spline.track_width:
             self.speed = 0  # Stop the car if it's off-track
             return True
         return False
+
+
+if numba is not None:
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _step_fleet(
+        position,
+        velocity,
+        heading,
+        speed,
+        steering_angle,
+        mass,
+        wheel_base,
+        max_steering_angle,
+        throttle,
+        brake,
+        steering_input,
+    ):
+        """
+        Fused equivalent of the numpy implementation of `CarFleet.step`, run in parallel over the cars. Updates the
+        state arrays in-place.
+        """
+        for i in numba.prange(heading.shape[0]):
+            steering_angle[i] = steering_input[i] * max_steering_angle[i]
+
+            # Apply acceleration
+            force = throttle[i] * 500 - brake[i] * 300  # Arbitrary force values
+            speed[i] += force / mass[i]
+
+            # Update position
+            velocity[i, 0] = speed[i] * math.sin(heading[i])
+            velocity[i, 1] = speed[i] * math.cos(heading[i])
+            position[i, 0] += velocity[i, 0]
+            position[i, 1] += velocity[i, 1]
+
+            # Apply Ackermann steering and centripetal force
+            tan_steering_angle = math.tan(steering_angle[i])
+            if tan_steering_angle != 0:  # otherwise the turning radius is infinite, and the heading doesn't change
+                turning_radius = wheel_base[i] / tan_steering_angle
+                heading[i] += speed[i] / turning_radius
+
+else:
+    _step_fleet = None
+
+
+class CarFleet:
+    """
+    Simulates a fleet of cars at once. The state of each car is stored in parallel numpy arrays (one element per car),
+    so that every step is a handful of vectorized operations, instead of one `Car.apply_controls` call per car.
+
+    `mass`, `tire_grip`, `wheel_base` and `max_steering_angle` can either be a single value (shared by all the cars),
+    or an array with one value per car.
+    """
+
+    def __init__(self, num_cars, mass=1000, tire_grip=1.2, wheel_base=2.5, max_steering_angle=np.radians(30)):
+        self.num_cars = num_cars
+        self.mass = np.broadcast_to(np.asarray(mass, dtype=np.float64), (num_cars,)).copy()
+        self.tire_grip = np.broadcast_to(np.asarray(tire_grip, dtype=np.float64), (num_cars,)).copy()
+        self.wheel_base = np.broadcast_to(np.asarray(wheel_base, dtype=np.float64), (num_cars,)).copy()
+        self.max_steering_angle = np.broadcast_to(np.asarray(max_steering_angle, dtype=np.float64), (num_cars,)).copy()
+        self.position = np.zeros((num_cars, 2))
+        self.velocity = np.zeros((num_cars, 2))
+        self.heading = np.zeros(num_cars)  # Orientation of each car in radians
+        self.steering_angle = np.zeros(num_cars)
+        self.speed = np.zeros(num_cars)
+
+    def step(self, throttle, brake, steering_input):
+        """
+        Apply the controls to every car in the fleet. Equivalent to calling `Car.apply_controls` once per car.
+
+        :param throttle: Throttle for each car (or a single value for all the cars).
+        :param brake: Brake for each car (or a single value for all the cars).
+        :param steering_input: Steering input (in the range [-1, 1]) for each car (or a single value for all the cars).
+        """
+        throttle = self._per_car(throttle)
+        brake = self._per_car(brake)
+        steering_input = self._per_car(steering_input)
+
+        if USE_NUMBA and _step_fleet is not None:
+            _step_fleet(
+                self.position,
+                self.velocity,
+                self.heading,
+                self.speed,
+                self.steering_angle,
+                self.mass,
+                self.wheel_base,
+                self.max_steering_angle,
+                throttle,
+                brake,
+                steering_input,
+            )
+            return
+
+        self.steering_angle = steering_input * self.max_steering_angle
+
+        # Apply acceleration
+        force = throttle * 500 - brake * 300  # Arbitrary force values
+        self.speed += force / self.mass
+
+        # Update position
+        self.velocity[:, 0] = self.speed * np.sin(self.heading)
+        self.velocity[:, 1] = self.speed * np.cos(self.heading)
+        self.position += self.velocity
+
+        # Apply Ackermann steering and centripetal force
+        self._apply_steering()
+
+    def _per_car(self, value):
+        # one float64 value per car
+        return np.broadcast_to(np.asarray(value, dtype=np.float64), (self.num_cars,))
+
+    def _apply_steering(self):
+        tan_steering_angle = np.tan(self.steering_angle)
+
+        # Cars without any steering have an infinite turning radius (and therefore no angular velocity)
+        turning_radius = np.divide(
+            self.wheel_base, tan_steering_angle, out=np.full(self.num_cars, np.inf), where=tan_steering_angle != 0
+        )
+        angular_velocity = self.speed / turning_radius
+
+        self.heading += angular_velocity
+
+    def get_lateral_force(self):
+        # Lateral force using simplified Pacejka formula
+        slip_angle = np.arctan2(self.velocity[:, 1], self.velocity[:, 0]) - self.heading
+        lateral_force = self.tire_grip * np.sin(slip_angle)
+        return lateral_force
+
+    def update_drift(self):
+        lateral_force = self.get_lateral_force()
+        drifting = np.abs(lateral_force) > self.tire_grip
+        drift_factor = np.where(drifting, lateral_force / self.tire_grip, 0)
+        self.velocity *= 1 - drift_factor[:, None]  # Simulate drift
+
+    def detect_boundaries(self, track_spline: TrackSpline):
+        """
+        Check which cars are out of bounds using the track spline, and stop them.
+
+        :return: Boolean array, True for each car that is off-track.
+        """
+        closest_points = track_spline.get_closest_points(self.position)
+        distance_to_track = vector_norms(self.position - closest_points)
+        off_track = distance_to_track > track_spline.track_width
+        self.speed[off_track] = 0  # Stop the cars that are off-track
+        return off_track
@@ -1,5 +1,9 @@
+import math
+
 import numpy as np
 
+from carsim.util import vector_norms
+
 
 WHEELSPIN_FACTOR = 0.01
 WHEELSPIN_TORQUE_SENSITIVITY = 2
@@ -10,14 +14,21 @@ TIRE_DEFORMATION_FACTOR = 0.1
 
 def get_max_allowed_traction_force_magnitude(effective_grip, vertical_load):
     """
-    Calculate the max traction force magnitude on the wheel, beyond which it starts slipping.
+    Calculate the max traction force magnitude on the wheel, beyond which it starts slipping. Works for a single wheel,
+    or a batch of wheels (N x 3 vertical loads).
 
     :param effective_grip: Friction-like coefficient for the tire.
     :param vertical_load: Vertical force vector applied on the wheel (newtons).
 
     :return: Max traction force magnitude (newtons).
     """
-    vertical_load_magnitude = np.linalg.norm(vertical_load)
+    if np.ndim(vertical_load) == 1:
+        # single wheel: scalar math on python floats is much faster than numpy for one 3-element vector
+        x, y, z = np.asarray(vertical_load).tolist()
+        vertical_load_magnitude = math.sqrt(x * x + y * y + z * z)
+        return effective_grip * vertical_load_magnitude**VERTICAL_LOAD_TO_GRIP_FACTOR
+
+    vertical_load_magnitude = vector_norms(vertical_load)
 
     return effective_grip * np.power(vertical_load_magnitude, VERTICAL_LOAD_TO_GRIP_FACTOR)
 
@@ -31,18 +42,40 @@ def get_reaction_force_on_axle(
     tire_forward_direction,
     tire_up_direction,
 ):
+    """
+    Calculate the reaction force on the axle. Works for a single wheel (3-element vectors, scalar values), or a batch of
+    wheels (N x 3 vectors, N-element arrays of values).
+
+    :param engine_torque: Torque applied on the wheel by the engine.
+    :param tire_radius: Radius of the tire.
+    :param max_traction_force: Max traction force magnitude (see `get_max_allowed_traction_force_magnitude`).
+    :param tire_stiffness: Stiffness of the tire.
+    :param inertial_force: Inertial force vector acting on the wheel.
+    :param tire_forward_direction: Unit vector in the tire's forward direction.
+    :param tire_up_direction: Unit vector in the tire's up direction.
+
+    :return: Reaction force vector (newtons).
+    """
+    tire_forward_direction = np.asarray(tire_forward_direction)
+    tire_up_direction = np.asarray(tire_up_direction)
+    inertial_force = np.asarray(inertial_force)
 
-    deformation_absorption = 1 - TIRE_DEFORMATION_FACTOR * tire_radius / tire_stiffness
+    deformation_absorption = np.asarray(1 - TIRE_DEFORMATION_FACTOR * tire_radius / tire_stiffness)
 
     # Compute engine force with deformation, in the negative tire forward direction
-    engine_force = -tire_forward_direction * (engine_torque / tire_radius) * deformation_absorption
+    engine_force = -tire_forward_direction * (engine_torque / tire_radius * deformation_absorption)[..., None]
 
     # Compute tire right vector as the cross product of tire forward and tire up vectors
-    tire_right_direction = np.cross(tire_forward_direction, tire_up_direction)
+    # (written out explicitly, since np.cross is slow for small vectors)
+    fx, fy, fz = tire_forward_direction[..., 0], tire_forward_direction[..., 1], tire_forward_direction[..., 2]
+    ux, uy, uz = tire_up_direction[..., 0], tire_up_direction[..., 1], tire_up_direction[..., 2]
+    tire_right_direction = np.stack([fy * uz - fz * uy, fz * ux - fx * uz, fx * uy - fy * ux], axis=-1)
 
     # Project the inertial force onto the tire right direction
     lateral_inertial_force = (
-        np.dot(inertial_force, tire_right_direction) * tire_right_direction * deformation_absorption
+        np.sum(inertial_force * tire_right_direction, axis=-1)[..., None]
+        * tire_right_direction
+        * deformation_absorption[..., None]
     )
 
     # Normalize lateral inertial force by friction multiplier
@@ -52,17 +85,16 @@ def get_reaction_force_on_axle(
     total_force = engine_force + normalized_lateral_inertial_force
 
     # Use magnitudes for comparison
-    total_force_magnitude = np.linalg.norm(total_force)
-    max_traction_force_magnitude = np.linalg.norm(max_traction_force)
+    total_force_magnitude = vector_norms(total_force)
+    max_traction_force_magnitude = np.abs(max_traction_force)
 
-    if total_force_magnitude <= max_traction_force_magnitude:
-        # No slip, return reaction force in tire forward direction with deformation absorption
-        reaction_force = tire_forward_direction * np.linalg.norm(engine_force) * deformation_absorption
-        return reaction_force
+    # No slip: reaction force in tire forward direction with deformation absorption
+    no_slip_reaction = vector_norms(engine_force) * deformation_absorption
 
-    # Slipping case
-    d = total_force_magnitude - max_traction_force_magnitude
+    # Slipping: reaction torque reduced by the amount of wheelspin
+    d = np.maximum(total_force_magnitude - max_traction_force_magnitude, 0)
     reaction_torque = engine_torque * (1 - WHEELSPIN_FACTOR * d**WHEELSPIN_TORQUE_SENSITIVITY)
-    reaction_force = tire_forward_direction * (reaction_torque / tire_radius) * deformation_absorption
+    slip_reaction = (reaction_torque / tire_radius) * deformation_absorption
 
-    return reaction_force
+    reaction = np.where(total_force_magnitude <= max_traction_force_magnitude, no_slip_reaction, slip_reaction)
+    return reaction[..., None] * tire_forward_direction
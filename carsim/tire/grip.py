@@ -59,9 +59,21 @@ print(f"Effective Grip: {effective_grip}")
 
 """
 
+from dataclasses import dataclass, fields
+
 import numpy as np
 
-from carsim.util import interpolate_curve, weighted_sum, as_np_array
+try:
+    import numba
+except ImportError:  # numba is optional, the numpy implementation is used if it isn't installed
+    numba = None
+
+try:
+    import numexpr
+except ImportError:  # numexpr is optional, plain numpy is used if it isn't installed
+    numexpr = None
+
+from carsim.util import make_weighted_sum, as_np_array
 
 OPTIMAL_CAMBER_FOR_REFERENCE_TIRE = -3.5  # Base optimal camber for reference width tires
 REFERENCE_TIRE_WIDTH = 305  # Reference width in mm (standard tire width)
@@ -114,63 +126,136 @@ TIRE_WIDTH_EFFECT = 0.2
 CAMBER_EFFECT = 0.2
 TEMPERATURE_EFFECT = 0.5
 TIRE_WEAR_EFFECT = 1
+_INV_TOTAL_EFFECT = 1.0 / (
+    TIRE_HARDNESS_EFFECT
+    + TIRE_PRESSURE_EFFECT
+    + TIRE_WIDTH_EFFECT
+    + CAMBER_EFFECT
+    + TEMPERATURE_EFFECT
+    + TIRE_WEAR_EFFECT
+)
+
+# dtype of the per-tire values. The grip factors aren't precision-critical, and float32 halves the memory traffic.
+GRIP_DTYPE = np.float32
+
+# Lookup tables, indexed by road type id
+ROAD_TYPES = ("asphalt", "concrete", "dirt", "gravel", "grass", "ice")
+ROAD_ID = {road_type: i for i, road_type in enumerate(ROAD_TYPES)}
+FRICTION_LUT = np.array(
+    [FRICTION_ASPHALT, FRICTION_CONCRETE, FRICTION_DIRT, FRICTION_GRAVEL, FRICTION_GRASS, FRICTION_ICE],
+    dtype=np.float32,
+)
+TREAD_GROUP_SMOOTH = 0  # asphalt, concrete
+TREAD_GROUP_LOOSE = 1  # dirt, gravel, grass
+TREAD_GROUP_ICE = 2
+TREAD_GROUP_LUT = np.array(
+    [TREAD_GROUP_SMOOTH, TREAD_GROUP_SMOOTH, TREAD_GROUP_LOOSE, TREAD_GROUP_LOOSE, TREAD_GROUP_LOOSE, TREAD_GROUP_ICE],
+    dtype=np.int8,
+)
+
+# Above this many tires, `road_type_ids` looks up only the distinct road types (found with np.unique)
+_ROAD_TYPE_UNIQUE_THRESHOLD = 64
+
+# Reference curves as numpy arrays, for use with np.interp
+_HARDNESS_X = np.array([x for x, _ in REFERENCE_HARDNESS_TO_TEMP_LOW_CURVE], dtype=np.float32)
+_TEMP_LOW_Y = np.array([y for _, y in REFERENCE_HARDNESS_TO_TEMP_LOW_CURVE], dtype=np.float32)
+_TEMP_HIGH_Y = np.array([y for _, y in REFERENCE_HARDNESS_TO_TEMP_HIGH_CURVE], dtype=np.float32)
+_WEAR_X = np.array([x for x, _ in REFERENCE_TIRE_WEAR_TO_GRIP_CURVE], dtype=np.float32)
+_WEAR_Y = np.array([y for _, y in REFERENCE_TIRE_WEAR_TO_GRIP_CURVE], dtype=np.float32)
+
+# Reference curves resampled over [0, 1] into dense tables, for O(1) linear lookups in the numba kernel (instead of a
+# binary search over the curve points). The curve points are multiples of 0.1, so they fall exactly on the grid.
+_CURVE_LUT_SIZE = 1001
+_curve_grid = np.linspace(0, 1, _CURVE_LUT_SIZE)
+_TEMP_LOW_LUT = np.interp(_curve_grid, _HARDNESS_X, _TEMP_LOW_Y).astype(np.float32)
+_TEMP_HIGH_LUT = np.interp(_curve_grid, _HARDNESS_X, _TEMP_HIGH_Y).astype(np.float32)
+_WEAR_LUT = np.interp(_curve_grid, _WEAR_X, _WEAR_Y).astype(np.float32)
+del _curve_grid
+
+# Use the fused numba kernel in `get_tire_grip` (if numba is installed)
+USE_NUMBA = numba is not None
+
+# Evaluate the final grip combination in `get_tire_grip` with numexpr (needs numexpr to be installed). Off by default,
+# since it was slower than plain numpy in single-core benchmarks, and its double constants promote float32 to float64.
+USE_NUMEXPR = False
+_GRIP_EXPRESSION = (
+    "base_friction * ("
+    f"{TIRE_HARDNESS_EFFECT!r} * hardness_factor"
+    f" + {TIRE_PRESSURE_EFFECT!r} * pressure_factor"
+    f" + {TIRE_WIDTH_EFFECT!r} * width_factor"
+    f" + {CAMBER_EFFECT!r} * camber_factor"
+    f" + {TEMPERATURE_EFFECT!r} * temperature_factor"
+    f" + {TIRE_WEAR_EFFECT!r} * tire_wear_factor"
+    f") * {_INV_TOTAL_EFFECT!r}"
+)
+
+# Print the weighted contribution of each factor in `get_tire_grip` (numpy implementation only), for debugging
+PRINT_GRIP_FACTORS = False
+_weighted_grip_factors = make_weighted_sum(
+    [
+        TIRE_HARDNESS_EFFECT,
+        TIRE_PRESSURE_EFFECT,
+        TIRE_WIDTH_EFFECT,
+        CAMBER_EFFECT,
+        TEMPERATURE_EFFECT,
+        TIRE_WEAR_EFFECT,
+    ]
+)
+
+
+def _float_dtype(x):
+    """
+    The float dtype for results computed from `x` (float32 stays float32, everything else becomes float64).
+    """
+    return np.result_type(np.asarray(x), np.float32)
+
+
+def _vectorize(*signatures):
+    """
+    Compile a scalar function into a numpy ufunc with `numba.vectorize`, for the given signatures. If numba isn't
+    installed, the function is returned as-is (and is expected to work on numpy arrays directly).
+    """
+    if numba is None:
+        return lambda fn: fn
+
+    return numba.vectorize(list(signatures), nopython=True, fastmath=True, cache=True)
 
 
 # Friction based on material properties of tire and road
-def material_friction(tire_material_coefficient, tread_amount, road_type, road_condition):
+def material_friction(tire_material_coefficient, tread_amount, road_id, road_condition):
     """
     Calculate the base static friction coefficient based on tire and road material.
 
     :param tire_material_coefficient: Static friction coefficient for tire material (μ_s).
     :param tread_amount: Factor (0 to 1) representing the amount of tread. 0 is no tread (i.e. slicks).
-    :param road_type: Type of surface. Accepted values: 'asphalt', 'concrete', 'dirt', 'gravel', 'ice'.
+    :param road_id: Road type id of the surface (see `road_type_ids`).
     :param road_condition: Factor (between 0 and 1) representing the road surface conditions.
 
     :return: Base static friction coefficient.
     """
 
     # Base friction coefficient for road types in perfect conditions
-
-    road_friction = np.zeros_like(tire_material_coefficient)
-
-    asphalt_mask = road_type == "asphalt"
-    concrete_mask = road_type == "concrete"
-    dirt_mask = road_type == "dirt"
-    gravel_mask = road_type == "gravel"
-    grass_mask = road_type == "grass"
-    ice_mask = road_type == "ice"
-
-    road_friction[asphalt_mask] = FRICTION_ASPHALT
-    road_friction[concrete_mask] = FRICTION_CONCRETE
-    road_friction[dirt_mask] = FRICTION_DIRT
-    road_friction[gravel_mask] = FRICTION_GRAVEL
-    road_friction[grass_mask] = FRICTION_GRASS
-    road_friction[ice_mask] = FRICTION_ICE
-
-    road_friction *= np.power(road_condition, 0.3)
+    road_friction = FRICTION_LUT[road_id] * np.power(road_condition, 0.3)
 
     # Adjust tread effectiveness based on road type and condition
     ## asphalt and concrete
     x = road_condition - 0.5
-    asphalt_concrete_tread_effect = 1 - 1 * np.power(tread_amount, 0.5) * np.sign(x) * np.power(abs(x), 0.5)
+    smooth_tread_effect = 1 - np.sqrt(tread_amount) * np.sign(x) * np.sqrt(np.abs(x))
 
     ## dirt, gravel, grass
-    dirt_gravel_grass_tread_effect = 1 + 0.5 * tread_amount
+    loose_tread_effect = 1 + 0.5 * tread_amount
 
     ## ice
     ice_tread_effect = 1
 
-    tread_effect = (
-        (asphalt_mask | concrete_mask) * asphalt_concrete_tread_effect
-        + (dirt_mask | gravel_mask | grass_mask) * dirt_gravel_grass_tread_effect
-        + ice_mask * ice_tread_effect
-    )
+    tread_effect = np.choose(TREAD_GROUP_LUT[road_id], [smooth_tread_effect, loose_tread_effect, ice_tread_effect])
 
     # Calculate final friction coefficient
     friction_coefficient = tire_material_coefficient * road_friction * tread_effect
     return friction_coefficient
 
 
+@_vectorize("float32(float32)", "float64(float64)")
 def tire_hardness_effect(tire_hardness_factor):
     """
     Calculate the effective friction based on tire hardness.
@@ -185,6 +270,7 @@ def tire_hardness_effect(tire_hardness_factor):
     return hardness_effect
 
 
+@_vectorize("float32(float32)", "float64(float64)")
 def tire_pressure_effect(tire_pressure):
     """
     Calculate the effective friction based on tire pressure.
@@ -199,6 +285,7 @@ def tire_pressure_effect(tire_pressure):
     return pressure_effect
 
 
+@_vectorize("float32(float32)", "float64(float64)")
 def tire_width_effect(tire_width):
     """
     Calculate the effective friction based on tire width.
@@ -213,24 +300,26 @@ def tire_width_effect(tire_width):
     return width_effect
 
 
+def _optimal_camber(tire_width):
+    """
+    Calculate the optimal camber angle (in degrees) for a tire, adjusted for its width (in millimeters).
+    """
+    return OPTIMAL_CAMBER_FOR_REFERENCE_TIRE + 0.05 * (tire_width - REFERENCE_TIRE_WIDTH) / REFERENCE_TIRE_WIDTH
+
+
 # Factor in camber
-def camber_effect(camber, tire_width):
+@_vectorize("float32(float32, float32)", "float64(float64, float64)")
+def camber_effect(camber, optimal_camber):
     """
     Adjust friction based on camber angle, vertical load, suspension stiffness, and tire width.
 
     :param camber: Camber angle in degrees.
-    :param tire_width: Width of the tire in millimeters.
+    :param optimal_camber: Optimal camber angle for the tire in degrees (see `_optimal_camber`).
 
     :return: Friction adjustment based on camber and tire width.
     """
-    # Base optimal camber values based on tire width
-    optimal_camber_adjustment = 0.05 * (tire_width - REFERENCE_TIRE_WIDTH) / REFERENCE_TIRE_WIDTH
-
-    # Adjusted optimal camber based on width
-    optimal_camber = OPTIMAL_CAMBER_FOR_REFERENCE_TIRE + optimal_camber_adjustment
-
     # Calculate camber effect based on difference from the adjusted optimal camber
-    return np.exp(-np.abs(camber - optimal_camber) / 5)  # Exponential decay for non-optimal camber
+    return np.exp(-np.abs(camber - optimal_camber) * 0.2)  # Exponential decay for non-optimal camber
 
 
 def temperature_effect(tire_temperature, tire_hardness_factor):
@@ -242,13 +331,10 @@ def temperature_effect(tire_temperature, tire_hardness_factor):
 
     :return: float: Friction adjustment based on temperature.
     """
-    low_optimal = interpolate_curve(tire_hardness_factor, REFERENCE_HARDNESS_TO_TEMP_LOW_CURVE)
-    high_optimal = interpolate_curve(tire_hardness_factor, REFERENCE_HARDNESS_TO_TEMP_HIGH_CURVE)
-
-    # mask for different temp conditions
-    cold_temp_mask = tire_temperature < low_optimal
-    optimal_temp_mask = (tire_temperature >= low_optimal) & (tire_temperature <= high_optimal)
-    overheated_temp_mask = tire_temperature > high_optimal
+    # np.interp always returns float64, so match the dtype of the temperatures
+    dtype = _float_dtype(tire_temperature)
+    low_optimal = np.interp(tire_hardness_factor, _HARDNESS_X, _TEMP_LOW_Y).astype(dtype, copy=False)
+    high_optimal = np.interp(tire_hardness_factor, _HARDNESS_X, _TEMP_HIGH_Y).astype(dtype, copy=False)
 
     # grips for different temp conditions
     cold_temp_grip = np.power(tire_temperature / low_optimal, 3)  # Decrease grip with temperature
@@ -257,11 +343,11 @@ def temperature_effect(tire_temperature, tire_hardness_factor):
     overheated_temp_grip = np.clip(1 - overheating_factor, 0, 1)  # Decrease grip, but not below 0
     overheated_temp_grip = np.power(overheated_temp_grip, 3)
 
-    # apply the correct grips
-    grip = (
-        cold_temp_mask * cold_temp_grip
-        + optimal_temp_mask * np.ones_like(temperature_effect)
-        + overheated_temp_mask * overheated_temp_grip
+    # pick the correct grip for each tire (full grip within the optimal temperature range)
+    grip = np.where(
+        tire_temperature < low_optimal,
+        cold_temp_grip,
+        np.where(tire_temperature > high_optimal, overheated_temp_grip, 1.0),
     )
 
     return grip
@@ -278,7 +364,226 @@ def tire_wear_effect(tire_wear):
     tire_wear = np.clip(tire_wear, 0, 1)
 
     # Friction effect scales with tire wear
-    return interpolate_curve(tire_wear, REFERENCE_TIRE_WEAR_TO_GRIP_CURVE)
+    return np.interp(tire_wear, _WEAR_X, _WEAR_Y).astype(_float_dtype(tire_wear), copy=False)
+
+
+def _unknown_road_type(road_type):
+    return ValueError(f"Unknown road type: {road_type}. Accepted values: {', '.join(ROAD_TYPES)}")
+
+
+def _check_road_ids(road_id):
+    """
+    Raise a ValueError if any of the given road type ids is out of range of the road type lookup tables.
+    """
+    if road_id.size == 0 or (road_id.min() >= 0 and road_id.max() < len(ROAD_TYPES)):
+        return
+
+    invalid = (road_id < 0) | (road_id >= len(ROAD_TYPES))
+    raise _unknown_road_type(road_id[invalid].flat[0])
+
+
+def road_type_ids(road_type):
+    """
+    Convert road type names to their ids (indices into the road type lookup tables).
+
+    :param road_type: Numpy array of road type names (or road type ids, which are returned as-is).
+
+    :return: int8 numpy array of road type ids, with the same shape as `road_type`.
+    """
+    if np.issubdtype(road_type.dtype, np.integer):
+        _check_road_ids(road_type)
+        return road_type.astype(np.int8, copy=False)
+
+    try:
+        if road_type.size <= _ROAD_TYPE_UNIQUE_THRESHOLD:
+            # small inputs (e.g. one car's tires): a plain lookup is cheaper than sorting with np.unique
+            ids = [ROAD_ID[name] for name in road_type.ravel().tolist()]
+            return np.array(ids, dtype=np.int8).reshape(road_type.shape)
+
+        # only look up each distinct road type once, since there are usually only a few of them
+        names, inverse = np.unique(road_type, return_inverse=True)
+        ids = np.array([ROAD_ID[name] for name in names], dtype=np.int8)
+    except KeyError as e:
+        raise _unknown_road_type(e.args[0]) from None
+
+    return ids[inverse].reshape(road_type.shape)
+
+
+if numba is not None:
+
+    @numba.njit(inline="always", fastmath=True, cache=True)
+    def _curve_lut_lookup(lut, x):
+        """
+        Linearly interpolate a dense curve table (see `_CURVE_LUT_SIZE`) at `x`, clamped to [0, 1].
+        """
+        t = min(max(x, 0.0), 1.0) * (_CURVE_LUT_SIZE - 1)
+        i = min(int(t), _CURVE_LUT_SIZE - 2)
+        f = t - i
+        return lut[i] * (1 - f) + lut[i + 1] * f
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _grip_kernel(
+        road_id,
+        tire_material_coeff,
+        tread_amount,
+        road_condition,
+        tire_width,
+        tire_hardness_factor,
+        tire_pressure,
+        tire_temperature,
+        tire_wear,
+        camber,
+        grip,
+    ):
+        """
+        Fused single-pass equivalent of the numpy implementation in `get_tire_grip`. Expects 1-D arrays of equal length,
+        with `road_id` holding road type ids (see `road_type_ids`) instead of road type names. The result is written
+        into `grip`.
+        """
+        n = tire_material_coeff.shape[0]
+
+        for i in numba.prange(n):
+            r = road_id[i]
+            condition = road_condition[i]
+            tread = tread_amount[i]
+            width = tire_width[i]
+            hardness = tire_hardness_factor[i]
+            temperature = tire_temperature[i]
+
+            # material friction
+            road_friction = FRICTION_LUT[r] * condition**0.3
+            tread_group = TREAD_GROUP_LUT[r]
+            if tread_group == TREAD_GROUP_SMOOTH:
+                x = condition - 0.5
+                tread_effect = 1 - np.sqrt(tread) * np.sign(x) * np.sqrt(abs(x))
+            elif tread_group == TREAD_GROUP_LOOSE:
+                tread_effect = 1 + 0.5 * tread
+            else:
+                tread_effect = 1.0
+            base_friction = tire_material_coeff[i] * road_friction * tread_effect
+
+            # tire factors
+            hardness_factor = np.sqrt(1 - hardness)
+            pressure_factor = (REFERENCE_OPTIMAL_PRESSURE / tire_pressure[i]) ** 0.7
+            width_factor = 1 + (width - REFERENCE_TIRE_WIDTH) / (2 * REFERENCE_TIRE_WIDTH)
+
+            optimal_camber = (
+                OPTIMAL_CAMBER_FOR_REFERENCE_TIRE + 0.05 * (width - REFERENCE_TIRE_WIDTH) / REFERENCE_TIRE_WIDTH
+            )
+            camber_factor = np.exp(-abs(camber[i] - optimal_camber) * 0.2)
+
+            low_optimal = _curve_lut_lookup(_TEMP_LOW_LUT, hardness)
+            high_optimal = _curve_lut_lookup(_TEMP_HIGH_LUT, hardness)
+            if temperature < low_optimal:
+                temperature_factor = (temperature / low_optimal) ** 3
+            elif temperature > high_optimal:
+                overheated = 1 - (temperature - high_optimal) / (high_optimal - low_optimal)
+                temperature_factor = max(overheated, 0.0) ** 3
+            else:
+                temperature_factor = 1.0
+
+            tire_wear_factor = _curve_lut_lookup(_WEAR_LUT, tire_wear[i])
+
+            grip_adjustment = (
+                TIRE_HARDNESS_EFFECT * hardness_factor
+                + TIRE_PRESSURE_EFFECT * pressure_factor
+                + TIRE_WIDTH_EFFECT * width_factor
+                + CAMBER_EFFECT * camber_factor
+                + TEMPERATURE_EFFECT * temperature_factor
+                + TIRE_WEAR_EFFECT * tire_wear_factor
+            ) * _INV_TOTAL_EFFECT
+
+            grip[i] = base_friction * grip_adjustment
+
+else:
+    _grip_kernel = None
+
+
+def _get_tire_grip_numba(road_id, *factors):
+    # broadcast everything to a common shape, and flatten into contiguous 1-D arrays for the kernel
+    road_id, *factors = np.broadcast_arrays(road_id, *factors)
+    shape = road_id.shape
+
+    road_id = np.ascontiguousarray(road_id).ravel()
+    factors = [np.ascontiguousarray(factor, dtype=GRIP_DTYPE).ravel() for factor in factors]
+
+    grip = np.empty(road_id.shape, dtype=GRIP_DTYPE)
+    _grip_kernel(road_id, *factors, grip)
+    return grip.reshape(shape)
+
+
+def _get_tire_grip_numpy(
+    road_id,
+    tire_material_coeff,
+    tread_amount,
+    road_condition,
+    tire_width,
+    tire_hardness_factor,
+    tire_pressure,
+    tire_temperature,
+    tire_wear,
+    camber,
+    out=None,
+):
+    # calculate the effects of the different factors
+    base_friction = material_friction(tire_material_coeff, tread_amount, road_id, road_condition)
+    hardness_factor = tire_hardness_effect(tire_hardness_factor)
+    pressure_factor = tire_pressure_effect(tire_pressure)
+    width_factor = tire_width_effect(tire_width)
+    camber_factor = camber_effect(camber, _optimal_camber(tire_width))
+    temperature_factor = temperature_effect(tire_temperature, tire_hardness_factor)
+    tire_wear_factor = tire_wear_effect(tire_wear)
+
+    if out is None:
+        factors = (base_friction, hardness_factor, pressure_factor, width_factor, camber_factor, temperature_factor)
+        out = np.empty(np.broadcast_shapes(*(np.shape(f) for f in factors), np.shape(tire_wear_factor)), GRIP_DTYPE)
+
+    if PRINT_GRIP_FACTORS:
+        _weighted_grip_factors(
+            [
+                hardness_factor,
+                pressure_factor,
+                width_factor,
+                camber_factor,
+                temperature_factor,
+                tire_wear_factor,
+            ],
+            print_labels=True,
+            labels=[
+                "hardness_factor",
+                "pressure_factor",
+                "width_factor",
+                "camber_factor",
+                "temperature_factor",
+                "tire_wear_factor",
+            ],
+        )
+
+    # Combine all factors to calculate the effective friction coefficient (aka "grip")
+    if USE_NUMEXPR and numexpr is not None:
+        return numexpr.evaluate(
+            _GRIP_EXPRESSION,
+            local_dict={
+                "base_friction": base_friction,
+                "hardness_factor": hardness_factor,
+                "pressure_factor": pressure_factor,
+                "width_factor": width_factor,
+                "camber_factor": camber_factor,
+                "temperature_factor": temperature_factor,
+                "tire_wear_factor": tire_wear_factor,
+            },
+            out=out,
+        )
+
+    grip_adjustment = (
+        TIRE_HARDNESS_EFFECT * hardness_factor
+        + TIRE_PRESSURE_EFFECT * pressure_factor
+        + TIRE_WIDTH_EFFECT * width_factor
+        + CAMBER_EFFECT * camber_factor
+        + TEMPERATURE_EFFECT * temperature_factor
+        + TIRE_WEAR_EFFECT * tire_wear_factor
+    ) * _INV_TOTAL_EFFECT
+    return np.multiply(base_friction, grip_adjustment, out=out)
 
 
 # Final function to combine all factors and return the effective friction coefficient (aka "grip")
@@ -299,7 +604,8 @@ def get_tire_grip(
 
     :param tire_material_coeff: Static friction coefficient for tire material (μ_s).
     :param tread_amount: Factor (0 to 1) representing the amount of tread. 0 is no tread (i.e. slicks).
-    :param road_type: Type of surface. Accepted values: 'asphalt', 'concrete', 'dirt', 'gravel', 'ice'.
+    :param road_type: Type of surface. Accepted values: 'asphalt', 'concrete', 'dirt', 'gravel', 'grass', 'ice' (or
+        their ids, see `road_type_ids`).
     :param road_condition: Factor (0 to 1) representing the road surface conditions.
     :param tire_width: Width of the tire in millimeters.
     :param tire_hardness_factor: Tire hardness (0 to 1, where 0 is soft and 1 is hard).
@@ -312,58 +618,104 @@ def get_tire_grip(
     """
 
     # ensure these are numpy arrays
-    tire_material_coeff = as_np_array(tire_material_coeff)
-    tread_amount = as_np_array(tread_amount)
-    road_type = as_np_array(road_type)
-    road_condition = as_np_array(road_condition)
-    tire_width = as_np_array(tire_width)
-    tire_hardness_factor = as_np_array(tire_hardness_factor)
-    tire_pressure = as_np_array(tire_pressure)
-    tire_temperature = as_np_array(tire_temperature)
-    tire_wear = as_np_array(tire_wear)
-    camber = as_np_array(camber)
+    tire_material_coeff = as_np_array(tire_material_coeff, dtype=GRIP_DTYPE)
+    tread_amount = as_np_array(tread_amount, dtype=GRIP_DTYPE)
+    road_id = road_type_ids(as_np_array(road_type))
+    road_condition = as_np_array(road_condition, dtype=GRIP_DTYPE)
+    tire_width = as_np_array(tire_width, dtype=GRIP_DTYPE)
+    tire_hardness_factor = as_np_array(tire_hardness_factor, dtype=GRIP_DTYPE)
+    tire_pressure = as_np_array(tire_pressure, dtype=GRIP_DTYPE)
+    tire_temperature = as_np_array(tire_temperature, dtype=GRIP_DTYPE)
+    tire_wear = as_np_array(tire_wear, dtype=GRIP_DTYPE)
+    camber = as_np_array(camber, dtype=GRIP_DTYPE)
+
+    get_grip = _get_tire_grip_numba if USE_NUMBA and _grip_kernel is not None else _get_tire_grip_numpy
+    return get_grip(
+        road_id,
+        tire_material_coeff,
+        tread_amount,
+        road_condition,
+        tire_width,
+        tire_hardness_factor,
+        tire_pressure,
+        tire_temperature,
+        tire_wear,
+        camber,
+    )
 
-    # calculate the effects of the different factors
-    base_friction = material_friction(tire_material_coeff, tread_amount, road_type, road_condition)
-    hardness_factor = tire_hardness_effect(tire_hardness_factor)
-    pressure_factor = tire_pressure_effect(tire_pressure)
-    width_factor = tire_width_effect(tire_width)
-    camber_factor = camber_effect(camber, tire_width)
-    temperature_factor = temperature_effect(tire_temperature, tire_hardness_factor)
-    tire_wear_factor = tire_wear_effect(tire_wear)
 
-    # print("Raw values:")
-    # print(
-    #     f"{base_friction=}\n{hardness_factor=}\n{pressure_factor=}\n{width_factor=}\n{camber_factor=}\n{temperature_factor=}\n{tire_wear_factor=}"
-    # )
+@dataclass
+class TireState:
+    """
+    The state of a batch of tires, for use with `get_tire_grip_batch`. Each field is a contiguous 1-D numpy array with
+    one element per tire (of dtype `GRIP_DTYPE`, except for `road_id`). See `get_tire_grip` for the meaning of each field.
 
-    # Combine all factors to calculate the effective friction coefficient (aka "grip")
-    grip_adjustment = weighted_sum(
-        [
-            hardness_factor,
-            pressure_factor,
-            width_factor,
-            camber_factor,
-            temperature_factor,
-            tire_wear_factor,
-        ],
-        [
-            TIRE_HARDNESS_EFFECT,
-            TIRE_PRESSURE_EFFECT,
-            TIRE_WIDTH_EFFECT,
-            CAMBER_EFFECT,
-            TEMPERATURE_EFFECT,
-            TIRE_WEAR_EFFECT,
-        ],
-        print_labels=False,
-        labels=[
-            "hardness_factor",
-            "pressure_factor",
-            "width_factor",
-            "camber_factor",
-            "temperature_factor",
-            "tire_wear_factor",
-        ],
+    The arrays can be updated in-place between calls, so that no conversions or copies are needed on every tick (the
+    road type ids are re-checked on every `get_tire_grip_batch` call).
+    """
+
+    tire_material_coeff: np.ndarray
+    tread_amount: np.ndarray
+    road_id: np.ndarray  # int8 road type ids, see `road_type_ids`
+    road_condition: np.ndarray
+    tire_width: np.ndarray
+    tire_hardness_factor: np.ndarray
+    tire_pressure: np.ndarray
+    tire_temperature: np.ndarray
+    tire_wear: np.ndarray
+    camber: np.ndarray
+
+    def __post_init__(self):
+        num_tires = len(self.road_id)
+        for f in fields(self):
+            arr = getattr(self, f.name)
+            dtype = np.int8 if f.name == "road_id" else GRIP_DTYPE
+            if not isinstance(arr, np.ndarray) or arr.dtype != dtype:
+                raise ValueError(f"TireState.{f.name} must be a numpy array of dtype {np.dtype(dtype).name}")
+            if arr.ndim != 1 or not arr.flags.c_contiguous:
+                raise ValueError(f"TireState.{f.name} must be a contiguous 1-D array")
+            if len(arr) != num_tires:
+                raise ValueError(f"TireState.{f.name} has {len(arr)} elements, expected {num_tires}")
+
+        _check_road_ids(self.road_id)
+
+    @property
+    def num_tires(self):
+        return len(self.road_id)
+
+
+def get_tire_grip_batch(state: TireState, out=None):
+    """
+    Calculate the effective friction coefficient (aka "grip") for a batch of tires. Same as `get_tire_grip`, but
+    without any input conversions, and optionally writing the result into a preallocated array.
+
+    :param state: TireState of the tires.
+    :param out: (Optional) `GRIP_DTYPE` array with one element per tire, to write the grip into.
+
+    :return: Effective grip (`out`, if it was given).
+    """
+    if out is None:
+        out = np.empty(state.num_tires, dtype=GRIP_DTYPE)
+    elif out.shape != (state.num_tires,) or out.dtype != GRIP_DTYPE:
+        raise ValueError(f"out must be a {np.dtype(GRIP_DTYPE).name} array of shape ({state.num_tires},)")
+
+    # the ids may have been changed in-place since construction, and the numba kernel doesn't bounds-check them
+    _check_road_ids(state.road_id)
+
+    args = (
+        state.road_id,
+        state.tire_material_coeff,
+        state.tread_amount,
+        state.road_condition,
+        state.tire_width,
+        state.tire_hardness_factor,
+        state.tire_pressure,
+        state.tire_temperature,
+        state.tire_wear,
+        state.camber,
     )
-    # print(f"Grip adjustment: {grip_adjustment}")
-    return base_friction * grip_adjustment
+    if USE_NUMBA and _grip_kernel is not None:
+        _grip_kernel(*args, out)
+        return out
+
+    return _get_tire_grip_numpy(*args, out=out)
@@ -1,5 +1,9 @@
 import numpy as np
 from scipy.interpolate import CubicSpline
+from scipy.spatial import cKDTree
+
+NUM_SAMPLES = 256  # Number of points sampled on the spline, for finding the closest point
+NUM_NEWTON_STEPS = 2  # Number of Newton iterations for refining the closest point (0 returns the closest sample)
 
 
 class TrackSpline:
@@ -8,17 +12,48 @@ class TrackSpline:
         self.spline_x = CubicSpline(np.arange(len(control_points)), [p[0] for p in control_points])
         self.spline_y = CubicSpline(np.arange(len(control_points)), [p[1] for p in control_points])
 
+        # Sample the spline once, since it doesn't change, and index the samples for fast nearest-neighbor queries
+        self._ts = np.linspace(0, len(control_points) - 1, NUM_SAMPLES)
+        self._samples = np.stack([self.spline_x(self._ts), self.spline_y(self._ts)], axis=1)
+        self._kdtree = cKDTree(self._samples)
+
+        # Derivatives, for refining the closest point
+        self._spline_dx = self.spline_x.derivative()
+        self._spline_dy = self.spline_y.derivative()
+        self._spline_ddx = self._spline_dx.derivative()
+        self._spline_ddy = self._spline_dy.derivative()
+
     def get_point(self, t):
         return np.array([self.spline_x(t), self.spline_y(t)])
 
     def get_closest_point(self, position):
-        # Naive implementation to find the closest point on the spline to the given position
-        min_dist = float("inf")
-        closest_point = None
-        for t in np.linspace(0, len(self.spline_x.c) - 1, 100):  # Sampling 100 points on the spline
-            point = self.get_point(t)
-            dist = np.linalg.norm(position - point)
-            if dist < min_dist:
-                min_dist = dist
-                closest_point = point
-        return closest_point
+        return self.get_closest_points(np.asarray(position)[None, :])[0]
+
+    def get_closest_points(self, positions):
+        """
+        Find the closest point on the spline for each of the given positions (an N x 2 array), in one batch.
+
+        :return: N x 2 array of the closest points.
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+
+        # Start from the closest sampled point
+        sample_d2, idx = self._kdtree.query(positions)
+        sample_d2 **= 2
+        t = self._ts[idx]
+
+        # Refine with Newton's method, by solving d/dt |spline(t) - position|^2 = 0
+        px, py = positions[:, 0], positions[:, 1]
+        for _ in range(NUM_NEWTON_STEPS):
+            ex, ey = self.spline_x(t) - px, self.spline_y(t) - py
+            dx, dy = self._spline_dx(t), self._spline_dy(t)
+            grad = ex * dx + ey * dy
+            hess = dx * dx + dy * dy + ex * self._spline_ddx(t) + ey * self._spline_ddy(t)
+            step = np.divide(grad, hess, out=np.zeros_like(grad), where=hess > 0)
+            t = np.clip(t - step, self._ts[0], self._ts[-1])
+
+        closest_points = np.stack([self.spline_x(t), self.spline_y(t)], axis=1)
+
+        # Fall back to the sampled point, in case the refinement didn't move closer
+        d2 = np.sum((closest_points - positions) ** 2, axis=1)
+        return np.where((d2 <= sample_d2)[:, None], closest_points, self._samples[idx])
@@ -6,6 +6,33 @@ def interpolate_curve(x, points):
     return np.interp(x, x_points, as_np_array(y_points))
 
 
+def make_weighted_sum(weights):
+    """
+    Create a function that calculates the weighted average of a list of values (or arrays of values), for a fixed
+    list of weights. The weights are converted (and their total is calculated) only once, instead of on every call.
+    """
+    weights_col = np.array(weights, dtype=np.float64).reshape(-1, 1)
+    inv_total = 1.0 / weights_col.sum()
+
+    def sum_fn(values, print_labels=False, labels=None):
+        values = np.array(values)
+
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+
+        weighted = values * weights_col
+
+        if print_labels:
+            print("")
+            for l, v in zip(labels, weighted * inv_total):
+                print(l, v)
+            print("")
+
+        return weighted.sum(axis=0) * inv_total
+
+    return sum_fn
+
+
 def weighted_sum(values, weights, print_labels=False, labels=None):
     values = np.array(values)
     weights = np.array(weights).reshape(-1, 1)
@@ -23,7 +50,16 @@ def weighted_sum(values, weights, print_labels=False, labels=None):
     return np.sum(values * weights, axis=0) / np.sum(weights)
 
 
-def as_np_array(arr):
+def as_np_array(arr, dtype=None):
     if not isinstance(arr, np.ndarray):
-        arr = np.array(arr)
+        arr = np.array(arr, dtype=dtype)
+    elif dtype is not None and arr.dtype != dtype:
+        arr = arr.astype(dtype)
     return arr
+
+
+def vector_norms(v):
+    """
+    Euclidean norms of vectors stored along the last axis of `v` (e.g. an N x 3 array gives N norms).
+    """
+    return np.sqrt(np.einsum("...i,...i->...", v, v))